@@ -2,55 +2,79 @@
 Tests for the Mergington High School API
 """
 
+import asyncio
+
 import pytest
-from fastapi.testclient import TestClient
-from src.app import app, activities
+import pytest_asyncio
+from fastapi import HTTPException
+from httpx import ASGITransport, AsyncClient
+from src.app import app, activities, signup_for_activity, unregister_from_activity
 
+# Query params for emails sent in more than one request, built once
+TEMPORARY_PARAMS = {"email": "temporary@mergington.edu"}
+WORKFLOW_PARAMS = {"email": "workflow@mergington.edu"}
+MULTISPORT_PARAMS = {"email": "multisport@mergington.edu"}
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
 
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """Create a single async test client for the FastAPI app, shared across the session"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
 
-@pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        name: {
-            "description": details["description"],
-            "schedule": details["schedule"],
-            "max_participants": details["max_participants"],
-            "participants": details["participants"].copy()
-        }
+
+@pytest.fixture(scope="session")
+def initial_participants():
+    """Snapshot the starting participants once; tuples so it can be shared as-is"""
+    return {
+        name: tuple(details["participants"])
         for name, details in activities.items()
     }
-    
+
+
+# Module-qualified name so pytest's lookup for this autouse fixture never has
+# to walk fixture definitions from other test modules sharing the same name
+@pytest.fixture(autouse=True)
+def reset_activities_test_api(request, initial_participants):
+    """Reset activities data after each test"""
     yield
     
-    # Restore original state after test
-    for name, details in original_activities.items():
+    # Read-only tests never touch participants, so skip the restore
+    if "readonly" in request.keywords:
+        return
+    
+    # Restore original state after test; the other fields are never mutated
+    for name, participants in initial_participants.items():
         if name in activities:
-            activities[name]["participants"] = details["participants"].copy()
+            activities[name]["participants"] = list(participants)
+
+
+def participants_of(activity_name):
+    """Return the current participants of an activity straight from the data store"""
+    return activities[activity_name]["participants"]
 
 
 class TestRootEndpoint:
     """Tests for the root endpoint"""
     
-    def test_root_redirects_to_index(self, client):
+    @pytest.mark.readonly
+    @pytest.mark.asyncio
+    async def test_root_redirects_to_index(self, client):
         """Test that root path redirects to static index.html"""
-        response = client.get("/", follow_redirects=False)
+        response = await client.get("/", follow_redirects=False)
         assert response.status_code == 307
         assert response.headers["location"] == "/static/index.html"
 
 
+@pytest.mark.readonly
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_all_activities(self, client):
+    @pytest.mark.asyncio
+    async def test_get_all_activities(self, client):
         """Test retrieving all activities"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         assert response.status_code == 200
         data = response.json()
         
@@ -66,9 +90,10 @@ class TestGetActivities:
             assert "participants" in details
             assert isinstance(details["participants"], list)
     
-    def test_activities_have_correct_structure(self, client):
+    @pytest.mark.asyncio
+    async def test_activities_have_correct_structure(self, client):
         """Test that activities have the expected structure"""
-        response = client.get("/activities")
+        response = await client.get("/activities")
         data = response.json()
         
         # Check specific activities exist
@@ -82,12 +107,27 @@ class TestGetActivities:
         assert "chess tournaments" in chess_club["description"].lower()
 
 
+@pytest.mark.readonly
+class TestGetActivity:
+    """Tests for GET /activities/{activity_name} endpoint"""
+    
+    @pytest.mark.asyncio
+    async def test_get_single_activity(self, client):
+        """Test retrieving a single activity by name"""
+        response = await client.get("/activities/Chess Club")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["max_participants"] == 12
+        assert data["participants"] == participants_of("Chess Club")
+
+
 class TestSignupForActivity:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_new_participant(self, client):
+    @pytest.mark.asyncio
+    async def test_signup_new_participant(self, client):
         """Test signing up a new participant for an activity"""
-        response = client.post(
+        response = await client.post(
             "/activities/Chess Club/signup",
             params={"email": "newstudent@mergington.edu"}
         )
@@ -96,65 +136,51 @@ class TestSignupForActivity:
         assert "Signed up newstudent@mergington.edu for Chess Club" in data["message"]
         
         # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "newstudent@mergington.edu" in activities_data["Chess Club"]["participants"]
+        assert "newstudent@mergington.edu" in participants_of("Chess Club")
     
-    def test_signup_duplicate_participant(self, client):
+    def test_signup_duplicate_participant(self):
         """Test that signing up the same participant twice fails"""
         email = "duplicate@mergington.edu"
         
         # First signup should succeed
-        response1 = client.post(
-            "/activities/Chess Club/signup",
-            params={"email": email}
-        )
-        assert response1.status_code == 200
+        signup_for_activity("Chess Club", email)
         
         # Second signup should fail
-        response2 = client.post(
-            "/activities/Chess Club/signup",
-            params={"email": email}
-        )
-        assert response2.status_code == 400
-        assert "already signed up" in response2.json()["detail"].lower()
+        with pytest.raises(HTTPException) as exc_info:
+            signup_for_activity("Chess Club", email)
+        assert exc_info.value.status_code == 400
+        assert "already signed up" in exc_info.value.detail.lower()
     
-    def test_signup_nonexistent_activity(self, client):
-        """Test signing up for a non-existent activity fails"""
-        response = client.post(
-            "/activities/Nonexistent Club/signup",
-            params={"email": "student@mergington.edu"}
-        )
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
-    
-    def test_signup_with_special_characters_in_activity_name(self, client):
+    @pytest.mark.asyncio
+    async def test_signup_with_special_characters_in_activity_name(self, client):
         """Test signing up for activities with URL encoding"""
-        response = client.post(
+        response = await client.post(
             "/activities/Soccer Team/signup",
             params={"email": "soccer@mergington.edu"}
         )
         assert response.status_code == 200
     
-    def test_signup_multiple_different_participants(self, client):
-        """Test signing up multiple different participants"""
+    @pytest.mark.asyncio
+    async def test_signup_multiple_different_participants(self, client):
+        """Test signing up multiple different participants concurrently"""
         participants = [
             "student1@mergington.edu",
             "student2@mergington.edu",
             "student3@mergington.edu"
         ]
         
-        for email in participants:
-            response = client.post(
+        responses = await asyncio.gather(*(
+            client.post(
                 "/activities/Drama Club/signup",
                 params={"email": email}
             )
+            for email in participants
+        ))
+        for response in responses:
             assert response.status_code == 200
         
         # Verify all participants were added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        drama_participants = activities_data["Drama Club"]["participants"]
+        drama_participants = set(participants_of("Drama Club"))
         
         for email in participants:
             assert email in drama_participants
@@ -163,118 +189,126 @@ class TestSignupForActivity:
 class TestUnregisterFromActivity:
     """Tests for DELETE /activities/{activity_name}/signup endpoint"""
     
-    def test_unregister_existing_participant(self, client):
+    @pytest.mark.asyncio
+    async def test_unregister_existing_participant(self, client):
         """Test unregistering an existing participant"""
         # First, sign up a participant
-        email = "temporary@mergington.edu"
-        client.post(
+        email = TEMPORARY_PARAMS["email"]
+        await client.post(
             "/activities/Chess Club/signup",
-            params={"email": email}
+            params=TEMPORARY_PARAMS
         )
         
         # Then unregister them
-        response = client.delete(
+        response = await client.delete(
             "/activities/Chess Club/signup",
-            params={"email": email}
+            params=TEMPORARY_PARAMS
         )
         assert response.status_code == 200
         data = response.json()
         assert "Unregistered" in data["message"]
         
         # Verify participant was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email not in activities_data["Chess Club"]["participants"]
+        assert email not in participants_of("Chess Club")
     
-    def test_unregister_nonexistent_participant(self, client):
+    @pytest.mark.readonly
+    def test_unregister_nonexistent_participant(self):
         """Test that unregistering a non-existent participant fails"""
-        response = client.delete(
-            "/activities/Chess Club/signup",
-            params={"email": "notregistered@mergington.edu"}
-        )
-        assert response.status_code == 400
-        assert "not signed up" in response.json()["detail"].lower()
-    
-    def test_unregister_from_nonexistent_activity(self, client):
-        """Test unregistering from a non-existent activity fails"""
-        response = client.delete(
-            "/activities/Nonexistent Club/signup",
-            params={"email": "student@mergington.edu"}
-        )
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
+        with pytest.raises(HTTPException) as exc_info:
+            unregister_from_activity("Chess Club", "notregistered@mergington.edu")
+        assert exc_info.value.status_code == 400
+        assert "not signed up" in exc_info.value.detail.lower()
     
-    def test_unregister_preexisting_participant(self, client):
+    @pytest.mark.asyncio
+    async def test_unregister_preexisting_participant(self, client):
         """Test unregistering a participant that was initially in the database"""
         # Get an existing participant
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        existing_email = activities_data["Chess Club"]["participants"][0]
+        existing_email = participants_of("Chess Club")[0]
         
         # Unregister them
-        response = client.delete(
+        response = await client.delete(
             "/activities/Chess Club/signup",
             params={"email": existing_email}
         )
         assert response.status_code == 200
         
         # Verify they were removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert existing_email not in activities_data["Chess Club"]["participants"]
+        assert existing_email not in participants_of("Chess Club")
+
+
+@pytest.mark.readonly
+class TestErrorResponses:
+    """Tests for activity requests that are rejected"""
+    
+    @pytest.mark.parametrize("method,url,email,status,detail", [
+        ("get", "/activities/Nonexistent Club",
+         "student@mergington.edu", 404, "not found"),
+        ("post", "/activities/Nonexistent Club/signup",
+         "student@mergington.edu", 404, "not found"),
+        ("delete", "/activities/Nonexistent Club/signup",
+         "student@mergington.edu", 404, "not found"),
+    ], ids=[
+        "get-nonexistent-activity",
+        "signup-nonexistent-activity",
+        "unregister-from-nonexistent-activity",
+    ])
+    @pytest.mark.asyncio
+    async def test_rejected_request(self, client, method, url, email, status, detail):
+        """Test that invalid activity requests fail with a clear message"""
+        response = await getattr(client, method)(url, params={"email": email})
+        assert response.status_code == status
+        assert detail in response.json()["detail"].lower()
 
 
 class TestEndToEndWorkflow:
     """End-to-end tests for common workflows"""
     
-    def test_complete_signup_and_unregister_workflow(self, client):
+    @pytest.mark.asyncio
+    async def test_complete_signup_and_unregister_workflow(self, client):
         """Test a complete workflow: signup, verify, then unregister"""
-        email = "workflow@mergington.edu"
+        email = WORKFLOW_PARAMS["email"]
         activity = "Basketball Club"
         
         # Get initial participant count
-        initial_response = client.get("/activities")
-        initial_count = len(initial_response.json()[activity]["participants"])
+        initial_count = len(participants_of(activity))
         
         # Sign up
-        signup_response = client.post(
+        signup_response = await client.post(
             f"/activities/{activity}/signup",
-            params={"email": email}
+            params=WORKFLOW_PARAMS
         )
         assert signup_response.status_code == 200
         
         # Verify signup
-        after_signup = client.get("/activities")
-        after_signup_count = len(after_signup.json()[activity]["participants"])
-        assert after_signup_count == initial_count + 1
-        assert email in after_signup.json()[activity]["participants"]
+        after_signup = participants_of(activity)
+        assert len(after_signup) == initial_count + 1
+        assert email in after_signup
         
         # Unregister
-        unregister_response = client.delete(
+        unregister_response = await client.delete(
             f"/activities/{activity}/signup",
-            params={"email": email}
+            params=WORKFLOW_PARAMS
         )
         assert unregister_response.status_code == 200
         
         # Verify unregistration
-        after_unregister = client.get("/activities")
-        after_unregister_count = len(after_unregister.json()[activity]["participants"])
-        assert after_unregister_count == initial_count
-        assert email not in after_unregister.json()[activity]["participants"]
+        after_unregister = participants_of(activity)
+        assert len(after_unregister) == initial_count
+        assert email not in after_unregister
     
-    def test_signup_multiple_activities(self, client):
+    @pytest.mark.asyncio
+    async def test_signup_multiple_activities(self, client):
         """Test that a student can sign up for multiple different activities"""
-        email = "multisport@mergington.edu"
+        email = MULTISPORT_PARAMS["email"]
         activities_list = ["Chess Club", "Programming Class", "Art Workshop"]
         
         for activity in activities_list:
-            response = client.post(
+            response = await client.post(
                 f"/activities/{activity}/signup",
-                params={"email": email}
+                params=MULTISPORT_PARAMS
             )
             assert response.status_code == 200
         
         # Verify student is in all activities
-        all_activities = client.get("/activities").json()
         for activity in activities_list:
-            assert email in all_activities[activity]["participants"]
+            assert email in participants_of(activity)